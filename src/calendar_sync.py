@@ -1,10 +1,16 @@
 """Google Calendar Sync Module for Timetable."""
 
+import json
 import os
-import pickle
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+import httplib2
+import pytz
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -14,7 +20,7 @@ from googleapiclient.errors import HttpError
 
 from src.parser import parse_timetable, ClassSlot
 
-# If modifying these scopes, delete the token.pickle file
+# If modifying these scopes, delete the token.json file
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
 # Day name to weekday number mapping (Monday=0)
@@ -28,22 +34,119 @@ DAY_TO_WEEKDAY = {
     'SUNDAY': 6
 }
 
+# Number of inserts sent per batch HTTP request
+BATCH_SIZE = 50
 
-def get_calendar_service():
+# Number of batch requests submitted concurrently
+MAX_WORKERS = 8
+
+# Rate-limited (429, or 403 with a rate-limit reason) and 5xx API errors
+# are retried with exponential backoff
+MAX_ATTEMPTS = 3
+BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded'})
+
+# Refresh the token in the background once it is this close to expiry.
+# google-auth refreshes synchronously ~4 min before expiry, so stay ahead of it.
+STALE_SECONDS = 300
+
+TOKEN_PATH = Path('token.json')
+
+# Keeps per-event output from concurrent batches on separate lines
+_print_lock = threading.Lock()
+
+# Per-thread calendar service, reused while the credentials are unchanged
+_local = threading.local()
+
+
+def _save_token(creds: Credentials, token_path: Path = TOKEN_PATH) -> None:
+    """Persist credentials for future runs."""
+    with open(token_path, 'w', encoding='utf-8') as token:
+        token.write(creds.to_json())
+
+
+class TokenCache:
     """
-    Authenticate and return Google Calendar service.
+    Wraps OAuth credentials and refreshes them ahead of expiry.
+    
+    States, based on time left before the token expires:
+    - FRESH: returned as-is
+    - STALE: still valid; a background refresh is started and the current
+      token is returned immediately
+    - EXPIRED: the caller blocks until the refresh completes
+    
+    Only one refresh runs at a time.
+    """
+    FRESH = 'fresh'
+    STALE = 'stale'
+    EXPIRED = 'expired'
+    
+    def __init__(self, creds: Credentials, stale_seconds: int = STALE_SECONDS):
+        self._creds = creds
+        self._stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._refreshing: Optional[Future] = None
+    
+    def state(self) -> str:
+        """Return FRESH, STALE or EXPIRED for the current token."""
+        if self._creds.expiry is None:
+            return self.FRESH
+        # google-auth stores expiry as naive UTC
+        now = datetime.now(pytz.utc).replace(tzinfo=None)
+        remaining = (self._creds.expiry - now).total_seconds()
+        if remaining <= 0:
+            return self.EXPIRED
+        if remaining <= self._stale_seconds:
+            return self.STALE
+        return self.FRESH
+    
+    def get(self) -> Credentials:
+        """Return usable credentials, refreshing them if needed."""
+        if self._creds.refresh_token:
+            state = self.state()
+            if state == self.STALE:
+                self._schedule_refresh()
+            elif state == self.EXPIRED:
+                self._schedule_refresh().result()
+        return self._creds
+    
+    def _schedule_refresh(self) -> Future:
+        """Start a refresh unless one is already in flight."""
+        with self._lock:
+            if self._refreshing is None or self._refreshing.done():
+                self._refreshing = self._executor.submit(self._refresh)
+            return self._refreshing
+    
+    def _refresh(self) -> None:
+        self._creds.refresh(Request())
+        _save_token(self._creds)
+
+
+_token_cache: Optional[TokenCache] = None
+
+
+def get_credentials() -> Credentials:
+    """
+    Load, refresh or obtain OAuth credentials for the Calendar API.
     
     First run will open browser for OAuth consent.
-    Subsequent runs use saved token.
+    Subsequent runs use saved token. Once loaded, credentials are kept
+    in a TokenCache so later calls never block on a token refresh
+    unless the token has actually expired.
     """
+    global _token_cache
+    if _token_cache is not None:
+        return _token_cache.get()
+    
     creds = None
-    token_path = Path('token.pickle')
+    token_path = TOKEN_PATH
     credentials_path = Path('credentials.json')
     
     # Load existing token
     if token_path.exists():
-        with open(token_path, 'rb') as token:
-            creds = pickle.load(token)
+        creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
     
     # Refresh or get new credentials
     if not creds or not creds.valid:
@@ -66,10 +169,32 @@ def get_calendar_service():
             creds = flow.run_local_server(port=0)
         
         # Save token for future runs
-        with open(token_path, 'wb') as token:
-            pickle.dump(creds, token)
+        _save_token(creds, token_path)
     
-    return build('calendar', 'v3', credentials=creds)
+    _token_cache = TokenCache(creds)
+    return creds
+
+
+def get_calendar_service():
+    """
+    Authenticate and return Google Calendar service.
+    
+    Each service owns its own HTTP transport, which is not thread-safe,
+    so services are cached per thread. Tokens are refreshed in place on
+    the shared credentials, so a cached service stays usable until the
+    credentials object itself is replaced. The bundled discovery document
+    is used, so building a service never hits the network.
+    """
+    creds = get_credentials()
+    if getattr(_local, 'creds', None) is not creds:
+        _local.service = build(
+            'calendar', 'v3',
+            credentials=creds,
+            cache_discovery=False,
+            static_discovery=True
+        )
+        _local.creds = creds
+    return _local.service
 
 
 def get_next_weekday(weekday: int, start_date: datetime) -> datetime:
@@ -131,6 +256,136 @@ def create_calendar_event(
     return event
 
 
+def get_existing_events(
+    service,
+    calendar_id: str,
+    time_min: datetime,
+    time_max: datetime
+) -> Set[Tuple[str, datetime]]:
+    """
+    Return (summary, start) for timed events already in the calendar.
+    
+    Args:
+        service: Calendar service
+        calendar_id: Google Calendar ID
+        time_min: Start of the range (timezone-aware)
+        time_max: End of the range (timezone-aware)
+    
+    Returns:
+        Set of (summary, timezone-aware start datetime) tuples
+    """
+    existing: Set[Tuple[str, datetime]] = set()
+    page_token = None
+    
+    while True:
+        response = service.events().list(
+            calendarId=calendar_id,
+            timeMin=time_min.isoformat(),
+            timeMax=time_max.isoformat(),
+            singleEvents=True,
+            maxResults=2500,
+            pageToken=page_token
+        ).execute(num_retries=MAX_ATTEMPTS - 1)
+        
+        for item in response.get('items', []):
+            start = item.get('start', {}).get('dateTime')
+            if start:
+                existing.add((item.get('summary', ''), datetime.fromisoformat(start)))
+        
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            break
+    
+    return existing
+
+
+def _is_retryable(exception: Exception) -> bool:
+    """Return True if a failed API call is worth retrying."""
+    # Dropped or reset connections are transient
+    if isinstance(exception, (OSError, httplib2.HttpLib2Error)):
+        return True
+    if not isinstance(exception, HttpError):
+        return False
+    status = exception.resp.status
+    if status in RETRY_STATUSES:
+        return True
+    if status != 403:
+        return False
+    
+    # Calendar reports most rate limiting as 403 with a reason in the body
+    try:
+        errors = json.loads(exception.content)['error']['errors']
+        return any(error.get('reason') in RATE_LIMIT_REASONS for error in errors)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return False
+
+
+def _insert_batch(
+    calendar_id: str,
+    inserts: List[Tuple[str, datetime, dict]]
+) -> Tuple[int, int]:
+    """
+    Insert one batch of events using a dedicated service.
+    
+    Returns:
+        Tuple of (created, failed) counts for the batch
+    """
+    service = get_calendar_service()
+    created = 0
+    failed = 0
+    retry: List[int] = []
+    handled: Set[int] = set()
+    final_attempt = False
+    
+    def _on_insert(request_id, response, exception):
+        """Tally the result of a single insert within the batch."""
+        nonlocal created, failed
+        index = int(request_id)
+        handled.add(index)
+        class_name, event_date, _ = inserts[index]
+        if exception is None:
+            created += 1
+            line = f"  ✓ {class_name} - {event_date.strftime('%a %d %b')}"
+        elif not final_attempt and _is_retryable(exception):
+            retry.append(index)
+            return
+        else:
+            failed += 1
+            line = f"  ✗ Failed: {class_name} - {exception}"
+        with _print_lock:
+            print(line)
+    
+    remaining = list(range(len(inserts)))
+    for attempt in range(MAX_ATTEMPTS):
+        final_attempt = attempt == MAX_ATTEMPTS - 1
+        batch = service.new_batch_http_request(callback=_on_insert)
+        for i in remaining:
+            batch.add(
+                service.events().insert(calendarId=calendar_id, body=inserts[i][2]),
+                request_id=str(i)
+            )
+        try:
+            batch.execute()
+        except Exception as e:
+            # The batch request itself failed, so inserts without a callback
+            # are retried if the error is transient, else counted as failed
+            lost = [i for i in remaining if i not in handled]
+            if not final_attempt and _is_retryable(e):
+                retry.extend(lost)
+            else:
+                failed += len(lost)
+                with _print_lock:
+                    print(f"  ✗ Failed batch of {len(lost)} events - {e}")
+        
+        if not retry:
+            break
+        time.sleep(BACKOFF_SECONDS * 2 ** attempt)
+        remaining, retry = retry, []
+        handled.clear()
+    
+    return created, failed
+
+
 def sync_timetable_to_calendar(
     csv_path: str,
     weeks: int = 16,
@@ -149,13 +404,16 @@ def sync_timetable_to_calendar(
         timezone: Timezone for events
         
     Returns:
-        Dict with created/failed event counts
+        Dict with created/failed/skipped event counts
+    
+    Events that already exist with the same title and start time are
+    skipped, so re-running a sync doesn't create duplicates.
     """
     # Parse timetable
     classes = parse_timetable(csv_path)
     print(f"Parsed {len(classes)} class slots from timetable")
     
-    # Get calendar service
+    # Authenticate up front; workers share the cached credentials
     service = get_calendar_service()
     
     # Default start date to next Monday
@@ -166,37 +424,58 @@ def sync_timetable_to_calendar(
     print(f"Creating events starting from: {start_date.strftime('%Y-%m-%d')}")
     print(f"Duration: {weeks} weeks")
     
-    created = 0
-    failed = 0
+    # First date of each weekday on or after start_date; later weeks are offsets
+    weekday_dates = [get_next_weekday(wd, start_date) for wd in range(7)]
+    
+    # Group classes by weekday once, dropping unknown day names
+    by_weekday: Dict[int, List[ClassSlot]] = {}
+    for class_slot in classes:
+        weekday = DAY_TO_WEEKDAY.get(class_slot.day)
+        if weekday is not None:
+            by_weekday.setdefault(weekday, []).append(class_slot)
+    
+    # Fetch events already in the sync range so they aren't inserted again
+    tz = pytz.timezone(timezone)
+    range_start = tz.localize(datetime.combine(start_date.date(), datetime.min.time()))
+    existing = get_existing_events(
+        service,
+        calendar_id,
+        range_start,
+        range_start + timedelta(weeks=weeks)
+    )
+    
+    inserts: List[Tuple[str, datetime, dict]] = []
+    skipped = 0
     
     for week in range(weeks):
-        week_start = start_date + timedelta(weeks=week)
-        
-        for class_slot in classes:
-            weekday = DAY_TO_WEEKDAY.get(class_slot.day)
-            if weekday is None:
-                continue
-            
-            event_date = get_next_weekday(weekday, week_start)
-            
-            # Skip if event_date is before week_start (shouldn't happen but safety check)
-            if event_date < week_start:
-                event_date += timedelta(weeks=1)
-            
-            event = create_calendar_event(service, class_slot, event_date, timezone)
-            
-            try:
-                service.events().insert(
-                    calendarId=calendar_id,
-                    body=event
-                ).execute()
-                created += 1
-                print(f"  ✓ {class_slot.class_name} - {event_date.strftime('%a %d %b')}")
-            except HttpError as e:
-                failed += 1
-                print(f"  ✗ Failed: {class_slot.class_name} - {e}")
-    
-    return {'created': created, 'failed': failed}
+        for weekday, day_classes in by_weekday.items():
+            event_date = weekday_dates[weekday] + timedelta(weeks=week)
+            for class_slot in day_classes:
+                event = create_calendar_event(service, class_slot, event_date, timezone)
+                start = tz.localize(datetime.fromisoformat(event['start']['dateTime']))
+                if (event['summary'], start) in existing:
+                    skipped += 1
+                    continue
+                inserts.append((class_slot.class_name, event_date, event))
+    
+    if skipped:
+        print(f"Skipping {skipped} events already in the calendar")
+    
+    # Split into batches and submit them concurrently
+    batches = [
+        inserts[i:i + BATCH_SIZE]
+        for i in range(0, len(inserts), BATCH_SIZE)
+    ]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(
+            lambda chunk: _insert_batch(calendar_id, chunk),
+            batches
+        ))
+    
+    created = sum(c for c, _ in results)
+    failed = sum(f for _, f in results)
+    
+    return {'created': created, 'failed': failed, 'skipped': skipped}
 
 
 def sync_single_week(
@@ -286,3 +565,4 @@ if __name__ == '__main__':
         print(f"Sync Complete!")
         print(f"  Created: {result['created']} events")
         print(f"  Failed: {result['failed']} events")
+        print(f"  Skipped: {result['skipped']} existing events")
@@ -3,12 +3,29 @@
 import logging
 import os
 from typing import Optional
+from urllib.parse import urlsplit
 
 import requests
 
+from src.http_client import post_json, warm_connection
+
 logger = logging.getLogger(__name__)
 
 
+def warm_discord_connection(webhook_url: Optional[str] = None) -> None:
+    """
+    Open a pooled connection to the webhook host ahead of the first send.
+    
+    Failures are ignored; the next send simply opens its own connection.
+    """
+    url = webhook_url or os.environ.get('DISCORD_WEBHOOK_URL')
+    if not url:
+        return
+    
+    parts = urlsplit(url)
+    warm_connection(f"{parts.scheme}://{parts.netloc}", "Discord")
+
+
 def send_discord_message(
     message: str,
     webhook_url: Optional[str] = None
@@ -35,15 +52,15 @@ def send_discord_message(
     }
     
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = post_json(url, payload, "Discord")
         
         if response.status_code == 204:
             logger.info("Discord message sent successfully")
             return True
         else:
-            logger.error(f"Discord error {response.status_code}: {response.text}")
+            logger.error("Discord error %s: %s", response.status_code, response.text)
             return False
             
     except requests.exceptions.RequestException as e:
-        logger.error(f"Discord request error: {e}")
+        logger.error("Discord request error: %s", e)
         return False
@@ -0,0 +1,65 @@
+"""Notification Dispatch Module for Timetable Telegram Notifier."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from src.matcher import PendingNotification
+from src.formatter import format_notification
+from src.sender import send_telegram_message
+from src.discord_sender import send_discord_message
+
+# Maximum number of messages in flight at once (see http_client.POOL_MAXSIZE)
+SEND_WORKERS = 8
+
+# Separator between notifications combined into a single message
+MESSAGE_SEPARATOR = "\n\n---\n\n"
+
+# Longest combined message sent in one request (Telegram's hard cap is 4096)
+TELEGRAM_MAX_LENGTH = 4000
+DISCORD_MAX_LENGTH = 2000
+
+# Shared across runs so the web server doesn't start new threads per request
+_send_pool = ThreadPoolExecutor(max_workers=SEND_WORKERS)
+
+
+def send_notifications(
+    pending: List[PendingNotification]
+) -> List[Tuple[PendingNotification, bool, bool]]:
+    """
+    Send all notifications to Telegram and Discord concurrently.
+    
+    Multiple notifications are combined into one message per platform when
+    it fits the platform's length limit; otherwise each is sent separately.
+    All sends are submitted up front, so a run costs roughly one round-trip.
+    
+    Returns:
+        List of (notification, telegram_ok, discord_ok), in the order of pending
+    """
+    if not pending:
+        return []
+    
+    messages = [format_notification(n) for n in pending]
+    telegram = _submit_sends(send_telegram_message, messages, TELEGRAM_MAX_LENGTH)
+    discord = _submit_sends(send_discord_message, messages, DISCORD_MAX_LENGTH)
+    return [
+        (notification, tg.result(), dc.result())
+        for notification, tg, dc in zip(pending, telegram, discord)
+    ]
+
+
+def _submit_sends(
+    send: Callable[[str], bool],
+    messages: List[str],
+    max_length: int
+) -> List["Future[bool]"]:
+    """
+    Submit messages to a sender, combined into one send if short enough.
+    
+    Returns:
+        One future per message; a combined send shares its future
+    """
+    combined = MESSAGE_SEPARATOR.join(messages)
+    if len(messages) > 1 and len(combined) <= max_length:
+        future = _send_pool.submit(send, combined)
+        return [future] * len(messages)
+    return [_send_pool.submit(send, m) for m in messages]
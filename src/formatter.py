@@ -1,6 +1,10 @@
 """Message Formatter Module for Timetable Telegram Notifier."""
 
+from datetime import time
+from functools import lru_cache
+
 from src.matcher import NotificationType, PendingNotification
+from src.parser import ClassSlot
 
 
 def get_notification_prefix(notification_type: NotificationType) -> str:
@@ -15,7 +19,7 @@ def get_notification_prefix(notification_type: NotificationType) -> str:
         return "NOW"
 
 
-def format_time_slot(start_time) -> str:
+def format_time_slot(start_time: time) -> str:
     """Format time for display (12-hour format, compact)."""
     hour = start_time.hour
     minute = start_time.minute
@@ -30,18 +34,14 @@ def format_time_slot(start_time) -> str:
     return f"{hour}:{minute:02d}{period}"
 
 
-def format_notification(notification: PendingNotification) -> str:
+@lru_cache(maxsize=256)
+def get_message_template(slot: ClassSlot) -> str:
     """
-    Format a notification into a compact smartwatch-friendly message.
-    No emojis, short and clear.
+    Render the parts of a class's message that don't depend on timing.
     
-    Example outputs:
-    - "Deep Learning in 10 min\nH15 | 9AM"
-    - "HCI NOW\nH14 | 10AM"
-    - "Deep Learning (Lab) in 5 min\nL509 | 4PM"
+    Returns a template with a single %s placeholder for the timing text,
+    e.g. "Deep Learning (Lab) %s\nL509 | 4PM".
     """
-    slot = notification.class_slot
-    timing = get_notification_prefix(notification.notification_type)
     time_str = format_time_slot(slot.start_time)
     
     # Build class name with details if present
@@ -52,5 +52,26 @@ def format_notification(notification: PendingNotification) -> str:
     # Compact location
     location = slot.location.split(',')[0].strip() if slot.location else "TBA"
     
-    # Compose compact message
-    return f"{class_display} {timing}\n{location} | {time_str}"
+    # Escape '%' in the static parts so only the timing is substituted
+    class_display = class_display.replace('%', '%%')
+    location = location.replace('%', '%%')
+    
+    return f"{class_display} %s\n{location} | {time_str}"
+
+
+@lru_cache(maxsize=512)
+def format_notification(notification: PendingNotification) -> str:
+    """
+    Format a notification into a compact smartwatch-friendly message.
+    No emojis, short and clear.
+    
+    Results are cached, so repeated pings within a notification window
+    reuse the already formatted message.
+    
+    Example outputs:
+    - "Deep Learning in 10 min\nH15 | 9AM"
+    - "HCI NOW\nH14 | 10AM"
+    - "Deep Learning (Lab) in 5 min\nL509 | 4PM"
+    """
+    template = get_message_template(notification.class_slot)
+    return template % get_notification_prefix(notification.notification_type)
@@ -0,0 +1,75 @@
+"""HTTP Client Module for Timetable Telegram Notifier."""
+
+import json
+import logging
+import time
+from types import ModuleType
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Pooled connections kept alive per host. Matches dispatch.SEND_WORKERS so
+# concurrent sends don't open connections the pool then has to discard.
+POOL_MAXSIZE = 8
+
+# Shared session so keep-alive connections are reused across sends
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE))
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Rate-limited (429) and 5xx responses are retried with exponential backoff
+MAX_ATTEMPTS = 3
+BACKOFF_SECONDS = 0.5
+
+
+def _encode_json(payload: dict) -> bytes:
+    """Encode a JSON request body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def post_json(url: str, payload: dict, service: str) -> requests.Response:
+    """
+    POST a JSON payload, retrying on 429 and 5xx responses.
+    
+    Args:
+        url: Endpoint to post to
+        payload: JSON-serialisable request body
+        service: Name used in retry log lines, e.g. "Telegram"
+    
+    Returns:
+        The last response received
+    """
+    body = _encode_json(payload)
+    for attempt in range(MAX_ATTEMPTS):
+        response = _SESSION.post(url, data=body, headers=_JSON_HEADERS, timeout=10)
+        retryable = response.status_code == 429 or response.status_code >= 500
+        if not retryable or attempt == MAX_ATTEMPTS - 1:
+            break
+        delay = BACKOFF_SECONDS * 2 ** attempt
+        logger.warning("%s returned HTTP %s, retrying in %ss", service, response.status_code, delay)
+        time.sleep(delay)
+    return response
+
+
+def warm_connection(url: str, service: str) -> None:
+    """
+    Open a pooled connection to url's host ahead of the first send.
+    
+    Failures are ignored; the next send simply opens its own connection.
+    """
+    try:
+        _SESSION.head(url, timeout=5)
+    except requests.exceptions.RequestException as e:
+        logger.debug("%s warm-up failed: %s", service, e)
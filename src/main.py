@@ -6,10 +6,8 @@ import sys
 from pathlib import Path
 
 from src.parser import parse_timetable
-from src.matcher import get_pending_notifications
-from src.formatter import format_notification
-from src.sender import send_telegram_message
-from src.discord_sender import send_discord_message
+from src.matcher import build_notification_index, get_pending_notifications
+from src.dispatch import send_notifications
 
 # Configure logging
 logging.basicConfig(
@@ -52,47 +50,48 @@ def main():
         logger.error("Timetable CSV not found. Checked: %s", [str(p) for p in csv_paths])
         sys.exit(1)
     
-    logger.info(f"Using timetable: {csv_path}")
+    logger.info("Using timetable: %s", csv_path)
     
     # Parse timetable
     try:
         classes = parse_timetable(str(csv_path))
-        logger.info(f"Parsed {len(classes)} class slots from timetable")
+        logger.info("Parsed %s class slots from timetable", len(classes))
     except FileNotFoundError:
-        logger.error(f"Timetable file not found: {csv_path}")
+        logger.error("Timetable file not found: %s", csv_path)
         sys.exit(1)
     except ValueError as e:
-        logger.error(f"Error parsing timetable: {e}")
+        logger.error("Error parsing timetable: %s", e)
         sys.exit(1)
     
     # Get pending notifications
-    pending = get_pending_notifications(classes, timezone=timezone)
+    notification_index = build_notification_index(classes)
+    pending = get_pending_notifications(notification_index, timezone=timezone)
     
     if not pending:
         logger.info("No notifications to send at this time")
         sys.exit(0)
     
-    logger.info(f"Found {len(pending)} notification(s) to send")
+    logger.info("Found %s notification(s) to send", len(pending))
     
-    # Send each notification
-    success_count = 0
     for notification in pending:
-        message = format_notification(notification)
-        logger.info(f"Sending notification for: {notification.class_slot.class_name}")
+        logger.info("Sending notification for: %s", notification.class_slot.class_name)
+    
+    # Send all notifications concurrently
+    success_count = 0
+    for notification, tg_ok, dc_ok in send_notifications(pending):
+        class_name = notification.class_slot.class_name
         
-        # Send to Telegram
-        if send_telegram_message(message):
+        if tg_ok:
             success_count += 1
         else:
-            logger.warning(f"Failed to send Telegram notification for: {notification.class_slot.class_name}")
+            logger.warning("Failed to send Telegram notification for: %s", class_name)
         
-        # Send to Discord
-        if send_discord_message(message):
-            logger.info(f"Discord notification sent for: {notification.class_slot.class_name}")
+        if dc_ok:
+            logger.info("Discord notification sent for: %s", class_name)
         else:
-            logger.warning(f"Failed to send Discord notification for: {notification.class_slot.class_name}")
+            logger.warning("Failed to send Discord notification for: %s", class_name)
     
-    logger.info(f"Sent {success_count}/{len(pending)} notifications successfully")
+    logger.info("Sent %s/%s notifications successfully", success_count, len(pending))
     
     # Exit with success even if some messages failed
     # (we don't want to fail the workflow for partial failures)
@@ -1,9 +1,9 @@
 """Time Matcher Module for Timetable Telegram Notifier."""
 
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import datetime
 from enum import Enum
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
 import pytz
 
@@ -17,7 +17,7 @@ class NotificationType(Enum):
     AT_TIME = 0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PendingNotification:
     """Represents a notification that needs to be sent."""
     class_slot: ClassSlot
@@ -35,63 +35,105 @@ DAY_MAP = {
     'SUNDAY': 6
 }
 
+# Notification windows, checked in order; at most one fires per class per run
+NOTIFICATION_WINDOWS = [
+    (NotificationType.TEN_MINUTES, 10),
+    (NotificationType.FIVE_MINUTES, 5),
+    (NotificationType.AT_TIME, 0),
+]
+
+# Allowed variance around each window, in minutes
+TOLERANCE_MINUTES = 2
+
+# Earliest a notification can fire before its class starts
+MAX_LEAD_MINUTES = max(w for _, w in NOTIFICATION_WINDOWS) + TOLERANCE_MINUTES
+
+# Timezones already resolved by pytz, keyed by name
+_TZ_CACHE: Dict[str, pytz.BaseTzInfo] = {}
+
+
+def _tz(name: str) -> pytz.BaseTzInfo:
+    """Return the pytz timezone for name, resolving it only once."""
+    tz = _TZ_CACHE.get(name)
+    if tz is None:
+        tz = _TZ_CACHE[name] = pytz.timezone(name)
+    return tz
+
+
+# Notifications keyed by the (weekday, minute of day) at which they fire
+NotificationIndex = Dict[Tuple[int, int], List[PendingNotification]]
+
+
+def build_notification_index(classes: List[ClassSlot]) -> NotificationIndex:
+    """
+    Precompute which notifications fire at each minute of the week.
+    
+    Each class gets an entry for every minute covered by its notification
+    windows (tolerance included), so a run is a single dict lookup.
+    Build this once after parsing and pass it to get_pending_notifications.
+    """
+    index: NotificationIndex = {}
+    for class_slot in classes:
+        weekday = DAY_MAP.get(class_slot.day)
+        if weekday is None:
+            continue
+        for minutes_until in range(-TOLERANCE_MINUTES, MAX_LEAD_MINUTES + 1):
+            fire_minute = class_slot.start_minutes - minutes_until
+            for notif_type, window_minutes in NOTIFICATION_WINDOWS:
+                if is_within_notification_window(
+                    class_slot.start_minutes,
+                    fire_minute,
+                    window_minutes
+                ):
+                    index.setdefault((weekday, fire_minute), []).append(
+                        PendingNotification(
+                            class_slot=class_slot,
+                            notification_type=notif_type
+                        )
+                    )
+                    break  # Only one notification per class per minute
+    return index
+
 
 def is_weekday(dt: datetime) -> bool:
     """Return True if datetime is Monday-Friday (weekday 0-4)."""
     return dt.weekday() < 5
 
 
-def get_day_name(dt: datetime) -> str:
-    """Get the day name (MONDAY, TUESDAY, etc.) from a datetime."""
-    days = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY', 'SUNDAY']
-    return days[dt.weekday()]
-
-
 def is_within_notification_window(
-    class_start: time,
-    current_dt: datetime,
+    class_start_minutes: int,
+    current_minutes: int,
     window_minutes: int,
-    tolerance_minutes: int = 2
+    tolerance_minutes: int = TOLERANCE_MINUTES
 ) -> bool:
     """
-    Check if class_start is within window_minutes of current time.
+    Check if the class starts within window_minutes of current time.
     
     Uses a tolerance to account for GitHub Actions timing variance.
     For example, with window=10 and tolerance=2, matches if class starts
     in 8-12 minutes from now.
     
     Args:
-        class_start: The class start time
-        current_dt: Current datetime (timezone-aware)
+        class_start_minutes: Class start as minutes of the day
+        current_minutes: Current time as minutes of the day
         window_minutes: Target minutes before class (10, 5, or 0)
         tolerance_minutes: Allowed variance (default 2 minutes)
     
     Returns:
         True if within the notification window
     """
-    # Create datetime for class start on the same day
-    class_dt = current_dt.replace(
-        hour=class_start.hour,
-        minute=class_start.minute,
-        second=0,
-        microsecond=0
+    minutes_until = class_start_minutes - current_minutes
+    return (
+        window_minutes - tolerance_minutes
+        <= minutes_until
+        <= window_minutes + tolerance_minutes
     )
-    
-    # Calculate minutes until class
-    diff = class_dt - current_dt
-    minutes_until = diff.total_seconds() / 60
-    
-    # Check if within tolerance of target window
-    lower_bound = window_minutes - tolerance_minutes
-    upper_bound = window_minutes + tolerance_minutes
-    
-    return lower_bound <= minutes_until <= upper_bound
 
 
 def get_pending_notifications(
-    classes: List[ClassSlot],
-    current_time: datetime = None,
-    timezone: str = "Asia/Kolkata"
+    classes: Union[List[ClassSlot], NotificationIndex],
+    current_time: Optional[datetime] = None,
+    timezone: Union[str, pytz.BaseTzInfo] = "Asia/Kolkata"
 ) -> List[PendingNotification]:
     """
     Check all classes and return those needing notifications.
@@ -100,15 +142,16 @@ def get_pending_notifications(
     Returns empty list on weekends.
     
     Args:
-        classes: List of ClassSlot objects from the timetable
+        classes: Index from build_notification_index, or a flat list of
+            ClassSlot objects from the timetable
         current_time: Current datetime (if None, uses now in specified timezone)
-        timezone: Timezone string (default: Asia/Kolkata for IST)
+        timezone: Timezone name or pytz timezone (default: Asia/Kolkata for IST)
     
     Returns:
         List of PendingNotification objects for classes needing alerts
     """
     # Get current time in specified timezone
-    tz = pytz.timezone(timezone)
+    tz = _tz(timezone) if isinstance(timezone, str) else timezone
     if current_time is None:
         current_dt = datetime.now(tz)
     else:
@@ -122,26 +165,22 @@ def get_pending_notifications(
     if not is_weekday(current_dt):
         return []
     
-    # Get current day name
-    current_day = get_day_name(current_dt)
+    weekday = current_dt.weekday()
+    current_minutes = current_dt.hour * 60 + current_dt.minute
     
-    # Filter classes for today
-    today_classes = [c for c in classes if c.day == current_day]
+    # Prebuilt index: notifications firing this minute are a single lookup
+    if isinstance(classes, dict):
+        return list(classes.get((weekday, current_minutes), []))
     
+    # Plain class list: scan today's classes rather than building an index
     pending: List[PendingNotification] = []
-    
-    # Check each notification window
-    notification_windows = [
-        (NotificationType.TEN_MINUTES, 10),
-        (NotificationType.FIVE_MINUTES, 5),
-        (NotificationType.AT_TIME, 0),
-    ]
-    
-    for class_slot in today_classes:
-        for notif_type, window_minutes in notification_windows:
+    for class_slot in classes:
+        if DAY_MAP.get(class_slot.day) != weekday:
+            continue
+        for notif_type, window_minutes in NOTIFICATION_WINDOWS:
             if is_within_notification_window(
-                class_slot.start_time,
-                current_dt,
+                class_slot.start_minutes,
+                current_minutes,
                 window_minutes
             ):
                 pending.append(PendingNotification(
@@ -149,5 +188,4 @@ def get_pending_notifications(
                     notification_type=notif_type
                 ))
                 break  # Only one notification per class per run
-    
     return pending
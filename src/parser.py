@@ -1,13 +1,29 @@
 """CSV Parser Module for Timetable Telegram Notifier."""
 
 import csv
+import os
+import pickle
 import re
-from dataclasses import dataclass
+import tempfile
+from dataclasses import dataclass, field
 from datetime import time
 from typing import List, Optional, Tuple
 
 
-@dataclass
+# Fallback for class entries the string fast path doesn't handle
+_ENTRY_RE = re.compile(r'^(.+?)\s*\((.+)\)$')
+
+# Session type prefixes, longest first so "Tutorial" isn't read as "Tut"
+_SPECIAL_PREFIXES = ('tutorial', 'lab', 'tut')
+
+# Cell values (uppercased) that don't represent a class
+SKIP_CELLS = frozenset({'LUNCH', 'FREE', ''})
+
+# Bump when ClassSlot or parsing changes so stale caches are ignored
+CACHE_VERSION = 5
+
+
+@dataclass(frozen=True, slots=True)
 class ClassSlot:
     """Represents a single class slot in the timetable."""
     day: str  # MONDAY, TUESDAY, etc.
@@ -16,6 +32,12 @@ class ClassSlot:
     class_name: str
     location: str
     details: Optional[str] = None  # Lab, Tutorial, etc.
+    start_minutes: int = field(init=False, repr=False)  # start_time as minutes of the day
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, 'start_minutes', self.start_time.hour * 60 + self.start_time.minute
+        )
 
 
 def parse_time_slot(time_str: str, is_afternoon: bool = False) -> Tuple[time, time]:
@@ -57,30 +79,90 @@ def parse_class_entry(entry: str) -> Tuple[str, str, Optional[str]]:
     """
     entry = entry.strip()
     
-    if not entry or entry.upper() in ('LUNCH', 'FREE'):
+    if entry.upper() in SKIP_CELLS:
         return entry, '', None
     
     # Match pattern: "Class Name (location info)"
-    match = re.match(r'^(.+?)\s*\((.+)\)$', entry)
-    if not match:
-        return entry, '', None
-    
-    class_name = match.group(1).strip()
-    location_info = match.group(2).strip()
+    # Fast path: split on the first '(' when the entry ends with ')'
+    paren = entry.find('(', 1)
+    if entry.endswith(')') and 0 < paren < len(entry) - 2 and '\n' not in entry:
+        class_name = entry[:paren].strip()
+        location_info = entry[paren + 1:-1].strip()
+    else:
+        match = _ENTRY_RE.match(entry)
+        if not match:
+            return entry, '', None
+        class_name = match.group(1).strip()
+        location_info = match.group(2).strip()
     
     # Check for special session types (Lab, Tut, Tutorial)
     details = None
     location = location_info
     
-    # Pattern for Lab/Tutorial entries: "Lab, L509, J3/X3" or "Tut, H14, X4"
-    special_match = re.match(r'^(Lab|Tut|Tutorial),?\s*(.+)$', location_info, re.IGNORECASE)
-    if special_match:
-        details = special_match.group(1)
-        location = special_match.group(2).strip()
+    # Lab/Tutorial entries look like "Lab, L509, J3/X3" or "Tut, H14, X4"
+    prefix = location_info[:8].lower()
+    for special in _SPECIAL_PREFIXES:
+        if prefix.startswith(special):
+            rest = location_info[len(special):]
+            # A lone trailing comma is kept as the location, as the
+            # original "(Lab|Tut|Tutorial),?\s*(.+)" pattern did
+            if rest.startswith(',') and len(rest) > 1:
+                rest = rest[1:]
+            rest = rest.strip()
+            if rest:
+                details = location_info[:len(special)]
+                location = rest
+            break
     
     return class_name, location, details
 
 
+def _parse_section(
+    rows: List[List[str]],
+    time_headers: List[str],
+    is_afternoon: bool
+) -> List[ClassSlot]:
+    """
+    Parse the day rows of one timetable section.
+    
+    Column headers are parsed into (start, end) times once up front;
+    columns with an invalid header are skipped.
+    """
+    column_times: List[Optional[Tuple[time, time]]] = []
+    for header in time_headers:
+        try:
+            column_times.append(parse_time_slot(header, is_afternoon=is_afternoon))
+        except ValueError:
+            column_times.append(None)
+    
+    slots: List[ClassSlot] = []
+    for row in rows:
+        if not row or not row[0]:
+            continue
+        day = row[0].upper()
+        if day == 'DAY':
+            continue
+        for cell, times in zip(row[1:], column_times):
+            if times is None:
+                continue
+            cell = cell.strip()
+            if cell.upper() in SKIP_CELLS:
+                continue
+            
+            class_name, location, details = parse_class_entry(cell)
+            if class_name and class_name.upper() not in SKIP_CELLS:
+                slots.append(ClassSlot(
+                    day=day,
+                    start_time=times[0],
+                    end_time=times[1],
+                    class_name=class_name,
+                    location=location,
+                    details=details
+                ))
+    
+    return slots
+
+
 def parse_timetable(csv_path: str) -> List[ClassSlot]:
     """
     Parse the CSV timetable and return a list of ClassSlot objects.
@@ -88,6 +170,9 @@ def parse_timetable(csv_path: str) -> List[ClassSlot]:
     Handles both morning (8:00-1:50) and afternoon (2:00-5:50) sections.
     Skips empty slots, LUNCH, and Free entries.
     
+    Parsed slots are cached in '<csv_path>.cache.pkl', keyed on the CSV's
+    modification time and size, so unchanged timetables aren't re-parsed.
+    
     Args:
         csv_path: Path to the CSV file
         
@@ -98,11 +183,65 @@ def parse_timetable(csv_path: str) -> List[ClassSlot]:
         FileNotFoundError: If CSV file doesn't exist
         ValueError: If CSV format is invalid
     """
-    slots: List[ClassSlot] = []
+    st = os.stat(csv_path)
+    key = (CACHE_VERSION, st.st_mtime_ns, st.st_size)
+    cache_path = csv_path + '.cache.pkl'
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached: Tuple[Tuple[int, int, int], List[ClassSlot]] = pickle.load(f)
+        if cached[0] == key:
+            return cached[1]
+    except (
+        OSError, pickle.UnpicklingError, EOFError, AttributeError,
+        ValueError, TypeError, IndexError, ImportError
+    ):
+        # Missing, truncated or outdated cache; fall back to parsing
+        pass
     
+    slots = _parse_csv(csv_path)
+    
+    # Write to a temp file and rename it into place, so other processes
+    # never read a partially written cache
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path) or '.', suffix='.tmp'
+        )
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, slots), f, protocol=pickle.HIGHEST_PROTOCOL)
+        # mkstemp creates the file owner-only; match a normally created file
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only checkout; caching is best-effort
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return slots
+
+
+def _read_rows(csv_path: str) -> List[List[str]]:
+    """
+    Read the CSV into rows of cells.
+    
+    Files without quoted cells are split on commas directly; anything
+    with quotes goes through csv.reader.
+    """
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        rows = list(reader)
+        text = f.read()
+    
+    lines = text.splitlines()
+    if '"' in text:
+        return list(csv.reader(lines))
+    return [line.split(',') if line else [] for line in lines]
+
+
+def _parse_csv(csv_path: str) -> List[ClassSlot]:
+    """Parse the CSV timetable without consulting the cache."""
+    slots: List[ClassSlot] = []
+    
+    rows = _read_rows(csv_path)
     
     if not rows:
         raise ValueError("CSV file is empty")
@@ -123,71 +262,21 @@ def parse_timetable(csv_path: str) -> List[ClassSlot]:
         raise ValueError("Could not find morning section header")
     
     # Parse morning section
-    morning_header = rows[morning_start]
-    time_slots_morning = morning_header[1:]  # Skip 'Day' column
-    
     morning_end = afternoon_start if afternoon_start else len(rows)
-    for row in rows[morning_start + 1:morning_end]:
-        if not row or not row[0] or row[0].upper() == 'DAY':
-            continue
-        day = row[0].upper()
-        for col_idx, cell in enumerate(row[1:], start=0):
-            if col_idx >= len(time_slots_morning):
-                break
-            cell = cell.strip() if cell else ''
-            if not cell or cell.upper() in ('LUNCH', 'FREE', ''):
-                continue
-            
-            time_slot_str = time_slots_morning[col_idx]
-            try:
-                start_t, end_t = parse_time_slot(time_slot_str, is_afternoon=False)
-            except ValueError:
-                continue
-            
-            class_name, location, details = parse_class_entry(cell)
-            if class_name and class_name.upper() not in ('LUNCH', 'FREE'):
-                slots.append(ClassSlot(
-                    day=day,
-                    start_time=start_t,
-                    end_time=end_t,
-                    class_name=class_name,
-                    location=location,
-                    details=details
-                ))
+    slots.extend(_parse_section(
+        rows[morning_start + 1:morning_end],
+        rows[morning_start][1:],  # Skip 'Day' column
+        is_afternoon=False
+    ))
     
     # Parse afternoon section if exists
     if afternoon_start is not None:
         afternoon_header = rows[afternoon_start]
-        time_slots_afternoon = [t for t in afternoon_header[1:] if t.strip()]
-        
-        for row in rows[afternoon_start + 1:]:
-            if not row or not row[0]:
-                continue
-            day = row[0].upper()
-            if day == 'DAY':
-                continue
-            for col_idx, cell in enumerate(row[1:], start=0):
-                if col_idx >= len(time_slots_afternoon):
-                    break
-                cell = cell.strip() if cell else ''
-                if not cell or cell.upper() in ('LUNCH', 'FREE', ''):
-                    continue
-                
-                time_slot_str = time_slots_afternoon[col_idx]
-                try:
-                    start_t, end_t = parse_time_slot(time_slot_str, is_afternoon=True)
-                except ValueError:
-                    continue
-                
-                class_name, location, details = parse_class_entry(cell)
-                if class_name and class_name.upper() not in ('LUNCH', 'FREE'):
-                    slots.append(ClassSlot(
-                        day=day,
-                        start_time=start_t,
-                        end_time=end_t,
-                        class_name=class_name,
-                        location=location,
-                        details=details
-                    ))
+        slots.extend(_parse_section(
+            rows[afternoon_start + 1:],
+            [t for t in afternoon_header[1:] if t.strip()],
+            is_afternoon=True
+        ))
     
     return slots
+
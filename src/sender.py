@@ -6,6 +6,8 @@ from typing import Optional
 
 import requests
 
+from src.http_client import post_json, warm_connection
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -14,7 +16,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+TELEGRAM_API_BASE = "https://api.telegram.org"
+TELEGRAM_API_URL = TELEGRAM_API_BASE + "/bot{token}/sendMessage"
+
+
+def warm_telegram_connection() -> None:
+    """
+    Open a pooled connection to the Telegram API ahead of the first send.
+    
+    Failures are ignored; the next send simply opens its own connection.
+    """
+    warm_connection(TELEGRAM_API_BASE, "Telegram")
 
 
 def send_telegram_message(
@@ -60,7 +72,7 @@ def send_telegram_message(
     }
     
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = post_json(url, payload, "Telegram")
         
         if response.status_code == 200:
             result = response.json()
@@ -68,18 +80,18 @@ def send_telegram_message(
                 logger.info("Message sent successfully")
                 return True
             else:
-                logger.error(f"Telegram API error: {result.get('description', 'Unknown error')}")
+                logger.error("Telegram API error: %s", result.get('description', 'Unknown error'))
                 return False
         else:
-            logger.error(f"HTTP error {response.status_code}: {response.text}")
+            logger.error("HTTP error %s: %s", response.status_code, response.text)
             return False
             
     except requests.exceptions.Timeout:
         logger.error("Request timed out while sending Telegram message")
         return False
     except requests.exceptions.RequestException as e:
-        logger.error(f"Request error: {e}")
+        logger.error("Request error: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Unexpected error sending message: {e}")
+        logger.error("Unexpected error sending message: %s", e)
         return False
@@ -2,69 +2,259 @@
 
 import os
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytz
 
 from src.parser import parse_timetable
-from src.matcher import get_pending_notifications
-from src.formatter import format_notification
-from src.sender import send_telegram_message
-from src.discord_sender import send_discord_message
+from src.matcher import NotificationIndex, build_notification_index, get_pending_notifications
+from src.dispatch import send_notifications
+from src.sender import warm_telegram_connection
+from src.discord_sender import warm_discord_connection
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 TIMEZONE = os.environ.get('TIMEZONE', 'Asia/Kolkata')
+TZ = pytz.timezone(TIMEZONE)
+TIMETABLE_PATH = 'Timetable_2026.csv'
 
+# Server processes sharing the port. /notify dedup is per process, so more
+# than one worker can send duplicates if pings land on different workers.
+WEB_WORKERS = int(os.environ.get('WEB_WORKERS', 1))
 
-def run_notifier():
-    """Run the notification logic."""
+# Notification index of the parsed timetable, keyed by (path, mtime)
+_timetable_cache: Dict[Tuple[str, int], NotificationIndex] = {}
+_timetable_lock = threading.Lock()
+
+
+def load_timetable(path: str = TIMETABLE_PATH) -> NotificationIndex:
+    """Return the notification index for path, re-parsing only when the file changes."""
+    key = (path, os.stat(path).st_mtime_ns)
+    with _timetable_lock:
+        notification_index = _timetable_cache.get(key)
+        if notification_index is None:
+            notification_index = build_notification_index(parse_timetable(path))
+            _timetable_cache.clear()
+            _timetable_cache[key] = notification_index
+    return notification_index
+
+
+# Notifier runs happen off the request thread; at most one is in flight
+_executor = ThreadPoolExecutor(max_workers=1)
+_run_lock = threading.Lock()
+
+
+def _run_in_background():
     try:
-        classes = parse_timetable('Timetable_2026.csv')
-        pending = get_pending_notifications(classes, timezone=TIMEZONE)
-        
-        if not pending:
-            return "No notifications needed"
+        result = run_notifier()
+        logger.info("Notifier run finished: %s", result)
+    finally:
+        _run_lock.release()
+
+
+def queue_notifier() -> bool:
+    """
+    Start a notifier run in the background.
+    
+    Returns:
+        True if a run was queued, False if one is already in flight
+    """
+    if not _run_lock.acquire(blocking=False):
+        return False
+    _executor.submit(_run_in_background)
+    return True
+
+
+# Result of the last run, so repeat pings in the same minute don't re-send
+_last_run = {'minute': None, 'result': ''}
+_last_run_lock = threading.Lock()
+
+
+def run_notifier():
+    """
+    Run the notification logic at most once per minute.
+    
+    A second call within the same minute returns the first call's result
+    without sending anything. Failed runs, including runs where every
+    send failed, are not remembered, so they can be retried straight away.
+    """
+    now = datetime.now(TZ)
+    minute = now.replace(second=0, microsecond=0)
+    
+    with _last_run_lock:
+        if _last_run['minute'] == minute:
+            return _last_run['result']
         
-        results = []
-        for notification in pending:
-            message = format_notification(notification)
-            tg_ok = send_telegram_message(message)
-            dc_ok = send_discord_message(message)
-            results.append(f"{notification.class_slot.class_name}: TG={tg_ok}, DC={dc_ok}")
+        try:
+            pending = get_pending_notifications(
+                load_timetable(), current_time=now, timezone=TZ
+            )
+            
+            if not pending:
+                result = "No notifications needed"
+                delivered = True
+            else:
+                # Telegram and Discord sends for all notifications go out concurrently
+                sent = send_notifications(pending)
+                results = [
+                    f"{notification.class_slot.class_name}: TG={tg_ok}, DC={dc_ok}"
+                    for notification, tg_ok, dc_ok in sent
+                ]
+                result = f"Sent {len(pending)} notifications: " + "; ".join(results)
+                delivered = any(tg_ok or dc_ok for _, tg_ok, dc_ok in sent)
+        except Exception as e:
+            logger.error("Error: %s", e)
+            return f"Error: {e}"
         
-        return f"Sent {len(pending)} notifications: " + "; ".join(results)
-    except Exception as e:
-        logger.error(f"Error: {e}")
-        return f"Error: {e}"
+        # If every send failed, let a repeat ping in this minute try again
+        if delivered:
+            _last_run.update(minute=minute, result=result)
+        return result
+
+
+def _handle_notify(handler: 'Handler'):
+    # Reply before talking to Telegram/Discord so the pinger isn't kept waiting
+    result = "queued" if queue_notifier() else "already running"
+    handler._send_text(202, result.encode())
+    logger.info("Request handled: %s", result)
+
+
+# Complete /health response, encoded once; skips per-request header formatting
+_HEALTH_RESPONSE = (
+    b'HTTP/1.1 200 OK\r\n'
+    b'Content-Type: text/plain\r\n'
+    b'Content-Length: 2\r\n'
+    b'\r\n'
+    b'OK'
+)
+
+
+def _handle_health(handler: 'Handler'):
+    handler.wfile.write(_HEALTH_RESPONSE)
+    # send_response is bypassed, so log the access line here (at DEBUG)
+    handler.log_request(200)
+
+
+# Path (without query string) -> request handler
+ROUTES = {
+    '/': _handle_notify,
+    '/notify': _handle_notify,
+    '/health': _handle_health,
+}
 
 
 class Handler(BaseHTTPRequestHandler):
+    # Keep connections open so repeated pings reuse one handler instance
+    protocol_version = 'HTTP/1.1'
+    # Close idle keep-alive connections so they don't pin a server thread
+    timeout = 45
+    
+    def _send_text(self, status: int, body: bytes = b''):
+        """Send a plain-text response with an explicit Content-Length."""
+        self.send_response(status)
+        self.send_header('Content-type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
     def do_GET(self):
-        if self.path == '/notify' or self.path == '/':
-            result = run_notifier()
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(result.encode())
-            logger.info(f"Request handled: {result}")
-        elif self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'OK')
+        route = ROUTES.get(self.path.split('?', 1)[0])
+        if route is None:
+            self._send_text(404)
         else:
-            self.send_response(404)
-            self.end_headers()
+            route(self)
     
     def log_message(self, format, *args):
-        logger.info("%s - %s" % (self.address_string(), format % args))
+        # Health probes are frequent; keep their access lines out of the INFO log
+        path = getattr(self, 'path', '').split('?', 1)[0]
+        level = logging.DEBUG if path == '/health' else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, "%s - %s", self.address_string(), format % args)
+
+
+def _warm_connections():
+    warm_telegram_connection()
+    warm_discord_connection()
+
+
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    """Threading server whose port is shared by several worker processes."""
+    
+    def server_bind(self):
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def _fork_workers(count: int) -> List[int]:
+    """
+    Fork count extra server processes.
+    
+    Returns:
+        The children's pids in the parent, an empty list in each child
+    """
+    children: List[int] = []
+    for _ in range(count):
+        pid = os.fork()
+        if pid == 0:
+            return []
+        children.append(pid)
+    return children
+
+
+def _stop_workers(children: List[int], signum: int) -> None:
+    """Forward signum to the worker processes and wait for them to exit."""
+    for pid in children:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
 
 
 def main():
     port = int(os.environ.get('PORT', 10000))
-    server = HTTPServer(('0.0.0.0', port), Handler)
-    logger.info(f"Server running on port {port}")
-    server.serve_forever()
+    
+    # Only share the port when running several workers; a single server
+    # should still fail with EADDRINUSE if another instance holds the port
+    server_class = ThreadingHTTPServer
+    children: List[int] = []
+    if WEB_WORKERS > 1 and hasattr(os, 'fork'):
+        server_class = ReusePortHTTPServer
+        # Fork before any threads start; each worker binds its own socket
+        # and the kernel spreads connections between them
+        children = _fork_workers(WEB_WORKERS - 1)
+    
+    if children:
+        # Pass shutdown signals on so workers don't outlive the parent
+        def _forward(signum, frame):
+            _stop_workers(children, signum)
+            children.clear()
+            raise SystemExit(128 + signum)
+        
+        signal.signal(signal.SIGTERM, _forward)
+        signal.signal(signal.SIGINT, _forward)
+    
+    # Handshake with Telegram/Discord now so the first /notify reuses the connection
+    threading.Thread(target=_warm_connections, daemon=True).start()
+    server = server_class(('0.0.0.0', port), Handler)
+    logger.info("Server running on port %s (pid %s)", port, os.getpid())
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        _stop_workers(children, signal.SIGTERM)
 
 
 if __name__ == '__main__':
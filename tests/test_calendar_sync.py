@@ -0,0 +1,136 @@
+"""Tests for the Google Calendar Sync Module."""
+
+import json
+from datetime import datetime
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from src import calendar_sync
+from src.calendar_sync import _insert_batch, _is_retryable
+
+
+def _http_error(status: int, reason: str = '') -> HttpError:
+    content = json.dumps({'error': {'code': status, 'errors': [{'reason': reason}]}})
+    return HttpError(httplib2.Response({'status': status}), content.encode())
+
+
+class FakeBatch:
+    """Batch request whose execute() is driven by the test's scenario."""
+    
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.request_ids = []
+    
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+    
+    def execute(self):
+        self.service.executed.append(list(self.request_ids))
+        self.service.scenario(self)
+
+
+class FakeService:
+    """Just enough of the Calendar service for _insert_batch."""
+    
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.executed = []
+    
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+    
+    def events(self):
+        return self
+    
+    def insert(self, calendarId, body):
+        return body
+
+
+@pytest.fixture
+def run_batch(monkeypatch):
+    """Run _insert_batch over three inserts against a scenario."""
+    monkeypatch.setattr(calendar_sync, 'BACKOFF_SECONDS', 0)
+    
+    def run(scenario):
+        service = FakeService(scenario)
+        monkeypatch.setattr(calendar_sync, 'get_calendar_service', lambda: service)
+        inserts = [(f"Class {i}", datetime(2026, 1, 5), {}) for i in range(3)]
+        return _insert_batch('primary', inserts), service.executed
+    
+    return run
+
+
+class TestIsRetryable:
+    """Rate limits, 5xx and transport errors are retried; the rest are not."""
+    
+    @pytest.mark.parametrize('error', [
+        _http_error(429),
+        _http_error(503),
+        _http_error(403, 'rateLimitExceeded'),
+        _http_error(403, 'userRateLimitExceeded'),
+        ConnectionResetError(),
+        httplib2.ServerNotFoundError(),
+    ])
+    def test_retryable(self, error):
+        assert _is_retryable(error)
+    
+    @pytest.mark.parametrize('error', [
+        _http_error(400),
+        _http_error(401),
+        _http_error(404),
+        _http_error(403, 'forbidden'),
+        HttpError(httplib2.Response({'status': 403}), b'not json'),
+        ValueError(),
+    ])
+    def test_not_retryable(self, error):
+        assert not _is_retryable(error)
+
+
+class TestInsertBatch:
+    """Per-insert and whole-batch failures are retried only when transient."""
+    
+    def test_per_insert_rate_limit_is_retried(self, run_batch):
+        def scenario(batch):
+            for request_id in batch.request_ids:
+                error = None
+                if request_id == '1' and len(batch.service.executed) == 1:
+                    error = _http_error(403, 'rateLimitExceeded')
+                batch.callback(request_id, {}, error)
+        
+        (created, failed), executed = run_batch(scenario)
+        
+        assert (created, failed) == (3, 0)
+        assert executed == [['0', '1', '2'], ['1']]
+    
+    def test_batch_level_503_is_retried(self, run_batch):
+        def scenario(batch):
+            if len(batch.service.executed) == 1:
+                raise _http_error(503)
+            for request_id in batch.request_ids:
+                batch.callback(request_id, {}, None)
+        
+        (created, failed), executed = run_batch(scenario)
+        
+        assert (created, failed) == (3, 0)
+        assert executed == [['0', '1', '2'], ['0', '1', '2']]
+    
+    def test_batch_level_400_fails_without_retry(self, run_batch):
+        def scenario(batch):
+            raise _http_error(400)
+        
+        (created, failed), executed = run_batch(scenario)
+        
+        assert (created, failed) == (0, 3)
+        assert len(executed) == 1
+    
+    def test_persistent_503_gives_up_after_max_attempts(self, run_batch):
+        def scenario(batch):
+            raise _http_error(503)
+        
+        (created, failed), executed = run_batch(scenario)
+        
+        assert (created, failed) == (0, 3)
+        assert len(executed) == calendar_sync.MAX_ATTEMPTS
@@ -0,0 +1,91 @@
+"""Tests for the Notification Dispatch Module."""
+
+import threading
+from datetime import time
+
+import pytest
+
+from src import dispatch
+from src.dispatch import MESSAGE_SEPARATOR, _submit_sends, send_notifications
+from src.formatter import format_notification
+from src.matcher import NotificationType, PendingNotification
+from src.parser import ClassSlot
+
+
+class Recorder:
+    """Stand-in sender that records every message it is given."""
+    
+    def __init__(self, ok: bool = True):
+        self.ok = ok
+        self.sent = []
+        self._lock = threading.Lock()
+    
+    def __call__(self, message: str) -> bool:
+        with self._lock:
+            self.sent.append(message)
+        return self.ok
+
+
+def _notification(class_name: str) -> PendingNotification:
+    slot = ClassSlot('MONDAY', time(9, 0), time(9, 50), class_name, 'H14')
+    return PendingNotification(slot, NotificationType.TEN_MINUTES)
+
+
+class TestSubmitSends:
+    """Messages are combined when they fit and sent one by one otherwise."""
+    
+    def test_combines_messages_that_fit(self):
+        send = Recorder()
+        futures = _submit_sends(send, ['a', 'b', 'c'], max_length=100)
+        
+        assert [f.result() for f in futures] == [True, True, True]
+        assert send.sent == [MESSAGE_SEPARATOR.join(['a', 'b', 'c'])]
+    
+    def test_combined_message_at_limit_is_combined(self):
+        send = Recorder()
+        messages = ['a' * 10, 'b' * 10]
+        limit = 20 + len(MESSAGE_SEPARATOR)
+        _submit_sends(send, messages, max_length=limit)[0].result()
+        
+        assert len(send.sent) == 1
+    
+    def test_falls_back_to_separate_sends_over_limit(self):
+        send = Recorder(ok=False)
+        messages = ['a' * 10, 'b' * 10]
+        limit = 20 + len(MESSAGE_SEPARATOR) - 1
+        futures = _submit_sends(send, messages, max_length=limit)
+        
+        assert [f.result() for f in futures] == [False, False]
+        assert sorted(send.sent) == messages
+    
+    def test_single_message_is_sent_as_is(self):
+        send = Recorder()
+        _submit_sends(send, ['only'], max_length=100)[0].result()
+        
+        assert send.sent == ['only']
+
+
+class TestSendNotifications:
+    """Each platform applies its own length limit."""
+    
+    @pytest.fixture
+    def senders(self, monkeypatch):
+        telegram, discord = Recorder(), Recorder(ok=False)
+        monkeypatch.setattr(dispatch, 'send_telegram_message', telegram)
+        monkeypatch.setattr(dispatch, 'send_discord_message', discord)
+        return telegram, discord
+    
+    def test_empty(self, senders):
+        assert send_notifications([]) == []
+        assert senders[0].sent == senders[1].sent == []
+    
+    def test_limits_are_per_platform(self, senders):
+        telegram, discord = senders
+        # Three ~900 character messages fit Telegram's limit but not Discord's
+        pending = [_notification(name * 900) for name in 'XYZ']
+        results = send_notifications(pending)
+        messages = [format_notification(n) for n in pending]
+        
+        assert results == [(n, True, False) for n in pending]
+        assert telegram.sent == [MESSAGE_SEPARATOR.join(messages)]
+        assert sorted(discord.sent) == sorted(messages)
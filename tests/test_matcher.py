@@ -0,0 +1,89 @@
+"""Tests for the Time Matcher Module."""
+
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+import pytz
+from hypothesis import given, strategies as st
+
+from src.matcher import (
+    DAY_MAP,
+    NOTIFICATION_WINDOWS,
+    build_notification_index,
+    get_pending_notifications,
+    is_within_notification_window,
+    PendingNotification,
+)
+from src.parser import ClassSlot, _parse_csv
+
+
+CSV_PATH = Path(__file__).parent.parent / 'Timetable_2026.csv'
+TZ = pytz.timezone('Asia/Kolkata')
+
+# A Monday, so the sweep covers Monday to Sunday in order
+WEEK_START = datetime(2026, 1, 5)
+
+
+def _linear_scan(classes, weekday: int, current_minutes: int):
+    """Check every class against every window, as the matcher used to."""
+    if weekday >= 5:
+        return []
+    pending = []
+    for class_slot in classes:
+        if DAY_MAP.get(class_slot.day) != weekday:
+            continue
+        for notif_type, window_minutes in NOTIFICATION_WINDOWS:
+            if is_within_notification_window(
+                class_slot.start_minutes, current_minutes, window_minutes
+            ):
+                pending.append(PendingNotification(class_slot, notif_type))
+                break
+    return pending
+
+
+class TestNotificationIndex:
+    """The minute index must agree with a scan over all classes."""
+    
+    def test_timetable_week_matches_linear_scan(self):
+        classes = _parse_csv(str(CSV_PATH))
+        index = build_notification_index(classes)
+        
+        fired = 0
+        for minute in range(7 * 24 * 60):
+            now = TZ.localize(WEEK_START + timedelta(minutes=minute))
+            expected = _linear_scan(classes, now.weekday(), now.hour * 60 + now.minute)
+            assert get_pending_notifications(index, current_time=now) == expected, now
+            fired += len(expected)
+        assert fired > 0
+    
+    @given(
+        st.lists(
+            st.tuples(
+                st.sampled_from(list(DAY_MAP) + ['HOLIDAY']),
+                st.integers(min_value=0, max_value=23 * 60 + 59),
+            ),
+            max_size=12,
+        ),
+        st.integers(min_value=0, max_value=6),
+        st.integers(min_value=0, max_value=23 * 60 + 59),
+    )
+    def test_random_classes_match_linear_scan(self, slots, weekday, current_minutes):
+        classes = [
+            ClassSlot(day, time(start // 60, start % 60), time(23, 59), f"Class {i}", 'H1')
+            for i, (day, start) in enumerate(slots)
+        ]
+        index = build_notification_index(classes)
+        now = TZ.localize(WEEK_START + timedelta(days=weekday, minutes=current_minutes))
+        
+        expected = _linear_scan(classes, weekday, current_minutes)
+        assert get_pending_notifications(index, current_time=now) == expected
+        # A flat class list is scanned directly and must agree too
+        assert get_pending_notifications(classes, current_time=now) == expected
+    
+    def test_result_is_a_copy(self):
+        classes = [ClassSlot('MONDAY', time(9, 0), time(9, 50), 'HCI', 'H14')]
+        index = build_notification_index(classes)
+        now = TZ.localize(datetime(2026, 1, 5, 8, 50))
+        
+        get_pending_notifications(index, current_time=now).clear()
+        assert len(get_pending_notifications(index, current_time=now)) == 1
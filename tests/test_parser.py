@@ -0,0 +1,168 @@
+"""Tests for the CSV Parser Module."""
+
+import os
+import pickle
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from hypothesis import given, strategies as st
+
+from src.parser import CACHE_VERSION, _parse_csv, parse_class_entry, parse_timetable
+
+
+REPO_ROOT = Path(__file__).parent.parent
+CSV_NAME = 'Timetable_2026.csv'
+
+
+def _reference_parse_class_entry(entry: str):
+    """
+    The original regex-only parser, with two intended fixes.
+    
+    "Tutorial" is matched before "Tut", and a cell starting with
+    "Tutorial" is never re-read as "Tut" + "orial": "(Tutorial, H1)" gives
+    details "Tutorial", and a bare "(Tutorial)" is a location, like "(Lab)".
+    """
+    entry = entry.strip()
+    if not entry or entry.upper() in ('LUNCH', 'FREE'):
+        return entry, '', None
+    match = re.match(r'^(.+?)\s*\((.+)\)$', entry)
+    if not match:
+        return entry, '', None
+    class_name = match.group(1).strip()
+    location_info = match.group(2).strip()
+    for special in ('Tutorial', 'Lab', 'Tut'):
+        if location_info.lower().startswith(special.lower()):
+            special_match = re.match(
+                rf'^({special}),?\s*(.+)$', location_info, re.IGNORECASE
+            )
+            if special_match:
+                return class_name, special_match.group(2).strip(), special_match.group(1)
+            break
+    return class_name, location_info, None
+
+
+def _build_command() -> str:
+    """Return the snapshot step of render.yaml's buildCommand."""
+    for line in (REPO_ROOT / 'render.yaml').read_text().splitlines():
+        if line.strip().startswith('buildCommand:'):
+            return line.split('&&')[-1].strip()
+    raise AssertionError("render.yaml has no buildCommand")
+
+
+def _run_python(args, cwd: Path) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    return subprocess.run(
+        [sys.executable, *args], cwd=cwd, env=env,
+        capture_output=True, text=True, check=True
+    )
+
+
+class TestDeploySnapshot:
+    """The snapshot written at build time must load in the server process."""
+    
+    def test_build_step_writes_loadable_cache(self, tmp_path):
+        shutil.copy(REPO_ROOT / CSV_NAME, tmp_path / CSV_NAME)
+        
+        command = shlex.split(_build_command())
+        assert command[0] == 'python'
+        _run_python(command[1:], cwd=tmp_path)
+        
+        cache_path = tmp_path / (CSV_NAME + '.cache.pkl')
+        assert cache_path.exists()
+        
+        # Load from a fresh interpreter, as the server would after deploy
+        check = (
+            "import os, pickle\n"
+            f"st = os.stat({CSV_NAME!r})\n"
+            f"with open({str(cache_path)!r}, 'rb') as f:\n"
+            "    key, slots = pickle.load(f)\n"
+            f"assert key == ({CACHE_VERSION}, st.st_mtime_ns, st.st_size), key\n"
+            "assert type(slots[0]).__module__ == 'src.parser'\n"
+            "print(len(slots))\n"
+        )
+        result = _run_python(['-c', check], cwd=tmp_path)
+        
+        with open(cache_path, 'rb') as f:
+            _, slots = pickle.load(f)
+        assert int(result.stdout) == len(slots)
+        assert slots == _parse_csv(str(tmp_path / CSV_NAME))
+
+
+class TestParseCache:
+    """A broken cache file falls back to parsing the CSV and is rewritten."""
+    
+    @pytest.mark.parametrize('content', [
+        b'',
+        b'not a pickle',
+        pickle.dumps((CACHE_VERSION, 0, 0))[:-5],
+        pickle.dumps(42),
+        pickle.dumps(()),
+        b'cmissing_module_for_test\nClassSlot\n.',
+        b'csrc.parser\nRenamedSlot\n.',
+    ], ids=['empty', 'garbage', 'truncated', 'not-a-tuple', 'empty-tuple',
+            'missing-module', 'missing-class'])
+    def test_corrupt_cache_falls_back_to_csv(self, tmp_path, content):
+        csv_path = tmp_path / CSV_NAME
+        shutil.copy(REPO_ROOT / CSV_NAME, csv_path)
+        cache_path = tmp_path / (CSV_NAME + '.cache.pkl')
+        cache_path.write_bytes(content)
+        
+        assert parse_timetable(str(csv_path)) == _parse_csv(str(csv_path))
+        with open(cache_path, 'rb') as f:
+            key, _ = pickle.load(f)
+        assert key[0] == CACHE_VERSION
+        assert not list(tmp_path.glob('*.tmp'))
+
+
+class TestParseClassEntry:
+    """Class cell parsing, covering both the fast path and the regex fallback."""
+    
+    @pytest.mark.parametrize('entry, expected', [
+        ('Deep Learning (H15, F)', ('Deep Learning', 'H15, F', None)),
+        ('Deep Learning (Lab, L509, J3/X3)', ('Deep Learning', 'L509, J3/X3', 'Lab')),
+        ('HCI (Tut, H14, X4)', ('HCI', 'H14, X4', 'Tut')),
+        ('HCI (lab L509)', ('HCI', 'L509', 'lab')),
+        ('  HCI   (H14)  ', ('HCI', 'H14', None)),
+        ('Compilers (Theory) (H2)', ('Compilers', 'Theory) (H2', None)),
+        ('(H14)', ('(H14)', '', None)),
+        ('Seminar', ('Seminar', '', None)),
+        ('LUNCH', ('LUNCH', '', None)),
+        ('free', ('free', '', None)),
+        ('', ('', '', None)),
+        ('x (Lab,)', ('x', ',', 'Lab')),
+        ('x (Lab, )', ('x', ',', 'Lab')),
+        ('x (Tut,)', ('x', ',', 'Tut')),
+        ('x (Tutorial,)', ('x', ',', 'Tutorial')),
+        ('x (Lab ,H1)', ('x', ',H1', 'Lab')),
+    ])
+    def test_entries(self, entry, expected):
+        assert parse_class_entry(entry) == expected
+    
+    def test_tutorial_is_not_read_as_tut(self):
+        # Previously parsed as details "Tut" with location "orial, H1"
+        assert parse_class_entry('HCI (Tutorial, H1)') == ('HCI', 'H1', 'Tutorial')
+    
+    @pytest.mark.parametrize('entry', ['HCI (Lab)', 'HCI (Tutorial)', 'HCI (TuToriaL)'])
+    def test_session_type_without_location_is_location(self, entry):
+        assert parse_class_entry(entry) == ('HCI', entry[5:-1], None)
+    
+    @given(st.one_of(
+        st.text(alphabet='abLTtuorial ()/,', max_size=30),
+        # Well-formed cells, so session types followed by commas and
+        # spaces are actually exercised
+        st.builds(
+            '{} ({}{}{}){}'.format,
+            st.text(alphabet='ab ', max_size=4),
+            st.sampled_from(['', 'Lab', 'lab', 'Tut', 'Tutorial', 'TUT']),
+            st.sampled_from(['', ',', ', ', ' ', ' ,']),
+            st.text(alphabet='H1, ', max_size=4),
+            st.sampled_from(['', ' ']),
+        ),
+    ))
+    def test_matches_reference_parser(self, entry):
+        assert parse_class_entry(entry) == _reference_parse_class_entry(entry)
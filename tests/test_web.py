@@ -0,0 +1,102 @@
+"""Tests for the web server's notifier runs."""
+
+from datetime import datetime, time
+
+import pytest
+
+from src import web
+from src.matcher import NotificationType, PendingNotification
+from src.parser import ClassSlot
+
+
+NOTIFICATION = PendingNotification(
+    ClassSlot('MONDAY', time(9, 0), time(9, 50), 'HCI', 'H14'),
+    NotificationType.TEN_MINUTES
+)
+
+
+class FakeClock:
+    """Replaces web.datetime so run_notifier sees a chosen time."""
+    
+    current = web.TZ.localize(datetime(2026, 1, 5, 8, 50, 5))
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def notifier(monkeypatch):
+    """Run run_notifier against a fixed clock, counting send batches."""
+    sends = []
+    
+    def fake_send(pending):
+        sends.append(pending)
+        return [(n, True, True) for n in pending]
+    
+    monkeypatch.setattr(web, 'datetime', FakeClock)
+    monkeypatch.setattr(FakeClock, 'current', FakeClock.current)
+    monkeypatch.setattr(web, '_last_run', {'minute': None, 'result': ''})
+    monkeypatch.setattr(web, 'load_timetable', lambda: {})
+    monkeypatch.setattr(web, 'get_pending_notifications', lambda *a, **kw: [NOTIFICATION])
+    monkeypatch.setattr(web, 'send_notifications', fake_send)
+    return sends
+
+
+class TestRunNotifierDedup:
+    """Repeat pings within a minute must not send again."""
+    
+    def test_same_minute_sends_once(self, notifier):
+        first = web.run_notifier()
+        FakeClock.current = FakeClock.current.replace(second=55)
+        second = web.run_notifier()
+        
+        assert len(notifier) == 1
+        assert second == first == "Sent 1 notifications: HCI: TG=True, DC=True"
+    
+    def test_next_minute_sends_again(self, notifier):
+        web.run_notifier()
+        FakeClock.current = FakeClock.current.replace(minute=51, second=0)
+        web.run_notifier()
+        
+        assert len(notifier) == 2
+    
+    def test_failed_run_is_retried(self, notifier, monkeypatch):
+        def failing_send(pending):
+            raise RuntimeError("boom")
+        
+        monkeypatch.setattr(web, 'send_notifications', failing_send)
+        assert web.run_notifier() == "Error: boom"
+        
+        monkeypatch.setattr(web, 'send_notifications', lambda p: notifier.append(p) or [])
+        web.run_notifier()
+        assert len(notifier) == 1
+    
+    def test_all_sends_failed_is_retried(self, notifier, monkeypatch):
+        def all_failed(pending):
+            notifier.append(pending)
+            return [(n, False, False) for n in pending]
+        
+        monkeypatch.setattr(web, 'send_notifications', all_failed)
+        assert web.run_notifier() == "Sent 1 notifications: HCI: TG=False, DC=False"
+        web.run_notifier()
+        assert len(notifier) == 2
+    
+    def test_partial_success_is_not_resent(self, notifier, monkeypatch):
+        def telegram_only(pending):
+            notifier.append(pending)
+            return [(n, True, False) for n in pending]
+        
+        monkeypatch.setattr(web, 'send_notifications', telegram_only)
+        web.run_notifier()
+        web.run_notifier()
+        assert len(notifier) == 1
+    
+    def test_nothing_to_send_is_remembered(self, notifier, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            web, 'get_pending_notifications', lambda *a, **kw: calls.append(1) or []
+        )
+        assert web.run_notifier() == "No notifications needed"
+        web.run_notifier()
+        assert len(calls) == 1